@@ -1,10 +1,21 @@
 # app.py — Streamlit UI (sidebar) with correct image/audio handling
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from requests.sessions import merge_setting
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+import orjson
+import ijson
 import time
-import base64
-from typing import List
+import threading
+import html as _html
+import blake3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+import pybase64
+from typing import BinaryIO, List, Optional
+from ui_static import CSS_STR, SIDEBAR_HEADER_HTML, MAIN_HEADER_HTML
 
 # ----------------------------
 # Configuration
@@ -16,42 +27,31 @@ AVAILABLE_MODELS = [
     {"id": "whisper", "title": "Whisper", "desc": "Audio → text transcription"},
     {"id": "gpt4o-vision", "title": "Vision", "desc": "Image understanding"}
 ]
+MODEL_LABELS = {m["id"]: f"{m['title']} — {m['desc']}" for m in AVAILABLE_MODELS}
+# n8n fans the selected models out itself; turn this on for a webhook that takes
+# one model per call so the client overlaps the requests instead
+PER_MODEL_FANOUT = False
+# identical (webhook, prompt, models, inputType, file) runs are served from memory
+RESPONSE_CACHE_TTL = 300
+RESPONSE_CACHE_MAX = 64
+# images go up as multipart binary (field 'prompt') like audio; set True only for
+# a workflow whose vision node still reads a data URL from $json.prompt
+USE_DATA_URL = False
+IMG_CACHE_MAX = 4
 
 # ----------------------------
 # Page setup & CSS (dark + sidebar)
 # ----------------------------
 st.set_page_config(page_title="n8n Multi — Sidebar UI", layout="wide", initial_sidebar_state="expanded")
 
-st.markdown(
-    """
-    <style>
-    .stApp { background: #0b0f12; color: #e6eef6; font-family: Inter, sans-serif; }
-    .header-card {
-        background: linear-gradient(180deg, rgba(255,255,255,0.02), rgba(255,255,255,0.01));
-        border-radius: 12px; padding: 18px; margin-bottom: 14px; border:1px solid rgba(255,255,255,0.03);
-    }
-    .avatar { width:34px; height:34px; border-radius:8px; background: linear-gradient(90deg,#fb923c,#ef4444); display:inline-block; margin-right:12px;}
-    .muted { color:#9fb0c8; font-size:13px; }
-    .results-card { background:#071018; border-radius:10px; padding:14px; border:1px solid rgba(255,255,255,0.03); }
-    .resp-card { background: transparent; border-radius:8px; padding:10px; margin-bottom:10px; border:1px solid rgba(255,255,255,0.02); }
-    .resp-title { font-weight:700; color:#e6eef6; font-size:14px; }
-    .resp-lat { color:#93aec6; font-size:12px; }
-    .muted-small { color:#93aec6; font-size:12px; }
-    .sidebar .stButton>button { background: linear-gradient(90deg,#4ade80,#60a5fa); color:#06202e; font-weight:700; border-radius:8px; }
-    .stTextArea textarea { background: #061018 !important; color: #e6eef6 !important; border: 1px solid rgba(255,255,255,0.03) !important; border-radius:8px !important; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# the CSS rides along with the main header as a single element; Streamlit drops
+# elements a rerun doesn't re-emit, so this is still written every run
+st.markdown(CSS_STR + MAIN_HEADER_HTML, unsafe_allow_html=True)
 
 # ----------------------------
 # Sidebar — controls
 # ----------------------------
-st.sidebar.markdown(
-    "<div style='display:flex; align-items:center; gap:12px;'><div style='width:34px;height:34px;border-radius:8px;background:linear-gradient(90deg,#fb923c,#ef4444)'></div>"
-    "<div><b style='font-size:16px'>n8n Multi — Controls</b><div class='muted' style='margin-top:4px'>Select models & input, then run.</div></div></div>",
-    unsafe_allow_html=True,
-)
+st.sidebar.markdown(SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
 st.sidebar.markdown("---")
 
 # Webhook (editable in sidebar)
@@ -59,19 +59,18 @@ webhook_input = st.sidebar.text_input("Webhook URL", value=WEBHOOK_URL)
 
 # Models
 st.sidebar.markdown("**Models**")
-selected_models = []
-for m in AVAILABLE_MODELS:
-    key = f"mdl_{m['id']}"
-    # default GPT-4o checked
-    default_checked = True if m['id'] == "gpt4o" else False
-    checked = st.sidebar.checkbox(f"{m['title']} — {m['desc']}", value=st.session_state.get(key, default_checked), key=key)
-    if checked:
-        selected_models.append(m['id'])
-
-# ensure at least one model
+selected_models = st.sidebar.multiselect(
+    "Models",
+    options=[m["id"] for m in AVAILABLE_MODELS],
+    default=["gpt4o"],
+    format_func=MODEL_LABELS.get,
+    key="sidebar_models",
+    label_visibility="collapsed",
+)
+
+# ensure at least one model (local fallback only — no session_state write, no extra rerun)
 if not selected_models:
     st.sidebar.warning("Select at least one model — defaulting to GPT-4o.")
-    st.session_state["mdl_gpt4o"] = True
     selected_models = ["gpt4o"]
 
 st.sidebar.markdown("---")
@@ -96,13 +95,6 @@ st.sidebar.markdown(f"<div class='muted-small'>{webhook_input}</div>", unsafe_al
 # ----------------------------
 # Main area
 # ----------------------------
-st.markdown(
-    "<div class='header-card'><div style='display:flex;align-items:center'><div class='avatar'></div>"
-    "<div><div style='font-size:18px;font-weight:700;color:#fff'>n8n Multi-Model UI — Sidebar</div>"
-    "<div class='muted' style='margin-top:6px'>Clean UI: controls in sidebar, results here.</div></div></div></div>",
-    unsafe_allow_html=True,
-)
-
 left_col, right_col = st.columns([1, 2])
 with left_col:
     st.markdown("### Request Summary", unsafe_allow_html=True)
@@ -123,35 +115,191 @@ with right_col:
 # ----------------------------
 # Helpers — sending requests
 # ----------------------------
-def send_json(url: str, prompt: str, models: List[str], inputType: str):
+def _warm_connection(session: requests.Session, url: str):
+    try:
+        session.head(url, timeout=5).close()
+    except requests.RequestException:
+        pass
+
+@st.cache_resource(show_spinner=False)
+def _get_session() -> requests.Session:
+    # one pooled session per process so reruns reuse the keep-alive TLS connection
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # open the DNS/TCP/TLS connection to the default webhook in the background so
+    # the first Run lands on a warm pool; any failure just means a cold first call
+    threading.Thread(target=_warm_connection, args=(session, WEBHOOK_URL), daemon=True).start()
+    return session
+
+SESSION = _get_session()
+
+def _get_executor() -> ThreadPoolExecutor:
+    # webhook calls run here so the script thread can keep the status line live; one
+    # small pool per browser session so sessions never queue behind each other, and
+    # its threads exit once the session state (and with it the pool) is dropped
+    if "_executor" not in st.session_state:
+        st.session_state["_executor"] = ThreadPoolExecutor(max_workers=4)
+    return st.session_state["_executor"]
+
+EXEC = _get_executor()
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _request_template(url: str, content_type: Optional[str] = None) -> requests.PreparedRequest:
+    # URL and session headers are prepared once per webhook; cookies are left out on
+    # purpose — the template is shared, so they're attached per send in _send_prepared
+    headers = {"Content-Type": content_type} if content_type else {}
+    req = requests.PreparedRequest()
+    req.prepare(
+        method="POST",
+        url=url,
+        headers=merge_setting(headers, SESSION.headers, dict_class=CaseInsensitiveDict),
+        auth=SESSION.auth,
+        hooks=SESSION.hooks,
+    )
+    return req
+
+def _send_prepared(url: str, content_type: Optional[str], data, files, timeout: int) -> requests.Response:
+    req = _request_template(url, content_type).copy()
+    req.prepare_body(data, files)
+    req.prepare_cookies(SESSION.cookies)
+    # Session.send skips the env proxy/CA lookup that Session.post does, so do it per call
+    settings = SESSION.merge_environment_settings(req.url, {}, True, None, None)
+    return SESSION.send(req, timeout=timeout, **settings)
+
+def send_json(url: str, prompt: str, models: List[str], inputType: str, prompt_txt: str = None):
     payload = {"prompt": prompt, "models": models, "inputType": inputType}
-    start = time.time()
-    r = requests.post(url, json=payload, timeout=120)
-    return r, time.time() - start
+    if prompt_txt:
+        payload["prompt_text"] = prompt_txt
+    # orjson encodes megabyte-scale prompts (data URLs) in C rather than via json.dumps
+    return _send_prepared(url, "application/json", orjson.dumps(payload), None, timeout=120)
 
-def send_multipart(url: str, file_bytes: bytes, filename: str, models: List[str], inputType: str, prompt_txt: str = None):
-    files = {"prompt": (filename, file_bytes)}
-    data = {"models": json.dumps(models), "inputType": inputType}
+def send_multipart(url: str, file_obj: BinaryIO, filename: str, models: List[str], inputType: str, prompt_txt: str = None):
+    # hand requests the upload handle itself instead of a read() copy of it
+    file_obj.seek(0)
+    files = {"prompt": (filename, file_obj, getattr(file_obj, "type", None) or "application/octet-stream")}
+    data = {"models": orjson.dumps(models).decode(), "inputType": inputType}
     # include textual prompt optionally for nodes expecting body.prompt
     if prompt_txt:
         data["prompt"] = prompt_txt
         data["prompt_text"] = prompt_txt
-    start = time.time()
-    r = requests.post(url, files=files, data=data, timeout=180)
-    return r, time.time() - start
+    return _send_prepared(url, None, data, files, timeout=180)
+
+_MIME = {"jpg": "image/jpeg", "jpeg": "image/jpeg", "gif": "image/gif", "webp": "image/webp", "png": "image/png"}
 
-def image_to_data_url(file_bytes: bytes, filename: str) -> str:
+def image_to_data_url(file_obj: BinaryIO, filename: str) -> str:
     # try to infer mime from extension (fallback to png)
     ext = filename.split(".")[-1].lower() if "." in filename else "png"
-    mime = "image/png"
-    if ext in ("jpg", "jpeg"):
-        mime = "image/jpeg"
-    elif ext == "gif":
-        mime = "image/gif"
-    elif ext == "webp":
-        mime = "image/webp"
-    b64 = base64.b64encode(file_bytes).decode("utf-8")
-    return f"data:{mime};base64,{b64}"
+    mime = _MIME.get(ext, "image/png")
+    # encode straight from the handle into one buffer; 57_000 is a multiple of 3 so
+    # the per-chunk outputs concatenate without padding. Decode once for the JSON body.
+    buf = bytearray(f"data:{mime};base64,".encode("ascii"))
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(57_000), b""):
+        buf += pybase64.b64encode(chunk)
+    file_obj.seek(0)
+    return buf.decode("ascii")
+
+@st.cache_resource(show_spinner=False)
+def _get_response_cache() -> OrderedDict:
+    return OrderedDict()
+
+@st.cache_resource(show_spinner=False)
+def _get_response_cache_lock() -> threading.Lock:
+    # the cache is process-wide, so every session's script thread touches it
+    return threading.Lock()
+
+def cache_get(key):
+    cache = _get_response_cache()
+    with _get_response_cache_lock():
+        hit = cache.get(key)
+        if hit is None:
+            return None
+        stored_at, items = hit
+        if time.time() - stored_at > RESPONSE_CACHE_TTL:
+            cache.pop(key, None)
+            return None
+        cache.move_to_end(key)
+        return items
+
+def cache_put(key, items):
+    cache = _get_response_cache()
+    with _get_response_cache_lock():
+        cache[key] = (time.time(), items)
+        cache.move_to_end(key)
+        while len(cache) > RESPONSE_CACHE_MAX:
+            cache.popitem(last=False)
+
+def upload_digest(file_obj: BinaryIO) -> str:
+    # hash in 1 MiB chunks; rewind so the upload can still be sent afterwards
+    h = blake3.blake3()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(1 << 20), b""):
+        h.update(chunk)
+    file_obj.seek(0)
+    return h.hexdigest()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _cached_upload_digest(file_id: str, name: str, size: int, _file_obj: BinaryIO) -> str:
+    # keyed on Streamlit's upload identity, so repeat runs skip re-reading the file
+    return upload_digest(_file_obj)
+
+def _close_result(fut):
+    if not fut.cancelled() and fut.exception() is None:
+        fut.result().close()
+
+def release_futures(futures):
+    """Cancel sends that haven't started and close every response the rest produce."""
+    for f in futures:
+        if not f.cancel():
+            f.add_done_callback(_close_result)
+
+def parse_body(content: bytes):
+    try:
+        return orjson.loads(content)
+    except Exception:
+        return {"raw": content.decode("utf-8", errors="replace")}
+
+class _TeeReader:
+    """Read-through wrapper that keeps what it has read until `keep` is cleared."""
+    def __init__(self, raw):
+        self.raw = raw
+        # read1 returns whatever has arrived; read(n) would block until ijson's
+        # 64 KiB buffer fills, holding back every card until the body ends
+        self._read = getattr(raw, "read1", raw.read)
+        self.buf = bytearray()
+        self.keep = True
+
+    def read(self, n=-1):
+        chunk = self._read(n)
+        if self.keep:
+            self.buf += chunk
+        return chunk
+
+def iter_response_items(resp):
+    """Yield {model, response, latencyMs} items as the body arrives.
+
+    A top-level "responses" list is parsed item by item; any other shape is
+    buffered and handed to normalize_response once the body is complete.
+    """
+    resp.raw.decode_content = True
+    tee = _TeeReader(resp.raw)
+    try:
+        for item in ijson.items(tee, "responses.item", use_float=True):
+            # streaming works for this body — stop buffering it
+            tee.keep = False
+            yield item
+    except ijson.JSONError:
+        if not tee.keep:
+            raise
+    if tee.keep:
+        tee.buf += resp.raw.read()
+        yield from normalize_response(parse_body(bytes(tee.buf)))
 
 def normalize_response(resp_json):
     """Return list of {model, response, latencyMs}"""
@@ -169,7 +317,27 @@ def normalize_response(resp_json):
                 else:
                     out.append({"model":k,"response":str(v),"latencyMs":0})
             return out
-    return [{"model":"result","response":json.dumps(resp_json,indent=2),"latencyMs":0}]
+    return [{"model":"result","response":orjson.dumps(resp_json, option=orjson.OPT_INDENT_2).decode(),"latencyMs":0}]
+
+def render_card(it) -> str:
+    # one element per card, so a streamed item is rendered once and never rebuilt
+    model = it.get("model","unknown")
+    text = it.get("response","")
+    lat = it.get("latencyMs",0)
+    # safe display: if text is bytes or non-str, convert
+    if not isinstance(text, str):
+        text = orjson.dumps(text, option=orjson.OPT_INDENT_2).decode()
+    # no leading indent: markdown would read an indented first line as a code block
+    return f"""<div class='resp-card'>
+              <div style='display:flex;justify-content:space-between;align-items:center;'>
+                <div>
+                  <div class='resp-title'>{_html.escape(str(model))}</div>
+                  <div class='resp-lat'>latency: {_html.escape(str(lat))} ms</div>
+                </div>
+              </div>
+              <div style='margin-top:8px;color:#dbeefe;font-size:14px;'><pre style='white-space:pre-wrap;font-family:Inter, monospace;font-size:13px;border:none;background:transparent;padding:0;margin:0;'>{_html.escape(text)}</pre></div>
+            </div>
+        """
 
 # ----------------------------
 # Run logic
@@ -178,83 +346,97 @@ if run:
     status.markdown("<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b>Sending request…</b></div>", unsafe_allow_html=True)
     results_box.empty()
 
+    futures = []
     try:
+        file_key = None
+        if uploaded_file is not None:
+            file_key = _cached_upload_digest(uploaded_file.file_id, uploaded_file.name, uploaded_file.size, uploaded_file)
+        cache_key = (webhook_input, prompt_text, tuple(sorted(selected_models)), input_type, file_key)
+        items = cache_get(cache_key)
+        start = time.time()
+
         # Decide how to send based on input_type
-        if input_type == "text" and uploaded_file is None:
+        if items is not None:
+            # cache hit -> nothing to send
+            futures = []
+
+        elif input_type == "text" and uploaded_file is None and PER_MODEL_FANOUT and len(selected_models) > 1:
+            # text only, one JSON request per model in flight at once
+            futures = [EXEC.submit(send_json, webhook_input, prompt_text, [m], input_type) for m in selected_models]
+
+        elif input_type == "text" and uploaded_file is None:
             # text only -> JSON
-            resp, elapsed = send_json(webhook_input, prompt_text, selected_models, input_type)
+            futures = [EXEC.submit(send_json, webhook_input, prompt_text, selected_models, input_type)]
 
-        elif input_type == "audio":
-            # audio -> always send RAW binary multipart under field name 'prompt'
+        elif input_type == "image" and USE_DATA_URL:
+            # image (data URL fallback) -> convert to base64 data URL and send as JSON in 'prompt' field
             if uploaded_file is None:
-                st.warning("No audio file uploaded — please upload an audio file for Whisper.")
+                st.warning("No image uploaded — please upload an image or change input type to text.")
                 status.markdown("<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#ef4444'>No file</b></div>", unsafe_allow_html=True)
-                results_box.text("Upload an audio file in the sidebar.")
-                raise SystemExit("No audio file uploaded")
-            file_bytes = uploaded_file.read()
+                results_box.text("Upload an image in the sidebar or switch to text mode.")
+                raise SystemExit("No image file uploaded")
             filename = uploaded_file.name
-            resp, elapsed = send_multipart(webhook_input, file_bytes, filename, selected_models, input_type, prompt_text if prompt_text else None)
+            # same image re-run in this session -> reuse its data URL
+            img_cache = st.session_state.setdefault("_img_cache", OrderedDict())
+            data_url = img_cache.get(file_key)
+            if data_url is not None:
+                img_cache.move_to_end(file_key)
+            else:
+                data_url = image_to_data_url(uploaded_file, filename)
+                img_cache[file_key] = data_url
+                while len(img_cache) > IMG_CACHE_MAX:
+                    img_cache.popitem(last=False)
+            # prompt = data_url (vision node expects imageUrls = {{$json.prompt}}), textual prompt as prompt_text
+            futures = [EXEC.submit(send_json, webhook_input, data_url, selected_models, input_type, prompt_text if prompt_text else None)]
 
-        elif input_type == "image":
-            # image -> convert to base64 data URL and send as JSON in 'prompt' field
+        elif input_type in ("audio", "image"):
+            # audio/image -> always send RAW binary multipart under field name 'prompt'
             if uploaded_file is None:
-                st.warning("No image uploaded — please upload an image or change input type to text.")
+                if input_type == "audio":
+                    st.warning("No audio file uploaded — please upload an audio file for Whisper.")
+                    results_box.text("Upload an audio file in the sidebar.")
+                else:
+                    st.warning("No image uploaded — please upload an image or change input type to text.")
+                    results_box.text("Upload an image in the sidebar or switch to text mode.")
                 status.markdown("<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#ef4444'>No file</b></div>", unsafe_allow_html=True)
-                results_box.text("Upload an image in the sidebar or switch to text mode.")
-                raise SystemExit("No image file uploaded")
-            file_bytes = uploaded_file.read()
+                raise SystemExit(f"No {input_type} file uploaded")
             filename = uploaded_file.name
-            data_url = image_to_data_url(file_bytes, filename)
-            # Build payload: prompt = data_url (vision node expects imageUrls = {{$json.prompt}})
-            payload = {"prompt": data_url, "models": selected_models, "inputType": input_type}
-            # Include textual prompt_text as separate field if present
-            if prompt_text:
-                payload["prompt_text"] = prompt_text
-            resp, elapsed = send_json(webhook_input, payload["prompt"], payload["models"], payload["inputType"]) if False else (requests.post(webhook_input, json=payload, timeout=120), time.time() - time.time())  # placeholder to ensure we have resp below
-
-            # The above line is a trick to preserve readable code: do actual call separately
-            # call properly:
-            start = time.time()
-            resp = requests.post(webhook_input, json=payload, timeout=120)
-            elapsed = time.time() - start
+            futures = [EXEC.submit(send_multipart, webhook_input, uploaded_file, filename, selected_models, input_type, prompt_text if prompt_text else None)]
 
         else:
             # fallback: json
-            resp, elapsed = send_json(webhook_input, prompt_text, selected_models, input_type)
-
-        # Handle response
-        if 200 <= resp.status_code < 300:
-            try:
-                body = resp.json()
-            except Exception:
-                body = {"raw": resp.text}
-            status.markdown(f"<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#10b981'>Success</b> — {elapsed:.2f}s</div>", unsafe_allow_html=True)
-            items = normalize_response(body)
-            html = "<div class='results-card'>"
-            for it in items:
-                model = it.get("model","unknown")
-                text = it.get("response","")
-                lat = it.get("latencyMs",0)
-                # safe display: if text is bytes or non-str, convert
-                if not isinstance(text, str):
-                    text = json.dumps(text, indent=2)
-                html += f"""
-                    <div class='resp-card'>
-                      <div style='display:flex;justify-content:space-between;align-items:center;'>
-                        <div>
-                          <div class='resp-title'>{model}</div>
-                          <div class='resp-lat'>latency: {lat} ms</div>
-                        </div>
-                      </div>
-                      <div style='margin-top:8px;color:#dbeefe;font-size:14px;'><pre style='white-space:pre-wrap;font-family:Inter, monospace;font-size:13px;border:none;background:transparent;padding:0;margin:0;'>{st.markdown(text, unsafe_allow_html=False) or ''}</pre></div>
-                    </div>
-                """
-            html += "</div>"
-            results_box.markdown(html, unsafe_allow_html=True)
+            futures = [EXEC.submit(send_json, webhook_input, prompt_text, selected_models, input_type)]
+
+        # Wait for the worker(s), ticking the elapsed time while they run
+        while wait(futures, timeout=0.25).not_done:
+            status.markdown(f"<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b>Waiting for response…</b> {time.time() - start:.1f}s</div>", unsafe_allow_html=True)
+        responses = [f.result() for f in futures]
+
+        # Handle response(s) — any non-2xx fails the whole run
+        failed = next((r for r in responses if not 200 <= r.status_code < 300), None)
+        if failed is None:
+            cards = results_box.container()
+            if items is None:
+                # render each card as soon as its JSON object has arrived
+                items = []
+                for r in responses:
+                    try:
+                        for it in iter_response_items(r):
+                            items.append(it)
+                            cards.markdown(render_card(it), unsafe_allow_html=True)
+                    finally:
+                        r.close()
+                cache_put(cache_key, items)
+                note = f"{time.time() - start:.2f}s"
+            else:
+                for it in items:
+                    cards.markdown(render_card(it), unsafe_allow_html=True)
+                note = "cached"
+            status.markdown(f"<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#10b981'>Success</b> — {note}</div>", unsafe_allow_html=True)
 
         else:
-            status.markdown(f"<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#ef4444'>Error {resp.status_code}</b></div>", unsafe_allow_html=True)
-            results_box.text(resp.text)
+            status.markdown(f"<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#ef4444'>Error {failed.status_code}</b></div>", unsafe_allow_html=True)
+            results_box.text(failed.text)
 
     except SystemExit:
         # handled above (just ignore)
@@ -262,3 +444,7 @@ if run:
     except Exception as exc:
         status.markdown(f"<div style='padding:12px;border-radius:8px;background:#071018;border:1px solid rgba(255,255,255,0.03)'><b style='color:#ef4444'>Request failed</b></div>", unsafe_allow_html=True)
         results_box.text(str(exc))
+    finally:
+        # also runs when a widget rerun or a failed fan-out future cuts the run short,
+        # so no stream=True response keeps a worker or a pooled connection
+        release_futures(futures)
@@ -0,0 +1,30 @@
+# ui_static.py — static CSS/HTML for app.py
+# Streamlit re-executes app.py on every rerun, but imported modules are loaded once
+# per process, so these strings are built once instead of on each widget interaction.
+
+CSS_STR = """
+    <style>
+    .stApp { background: #0b0f12; color: #e6eef6; font-family: Inter, sans-serif; }
+    .header-card {
+        background: linear-gradient(180deg, rgba(255,255,255,0.02), rgba(255,255,255,0.01));
+        border-radius: 12px; padding: 18px; margin-bottom: 14px; border:1px solid rgba(255,255,255,0.03);
+    }
+    .avatar { width:34px; height:34px; border-radius:8px; background: linear-gradient(90deg,#fb923c,#ef4444); display:inline-block; margin-right:12px;}
+    .muted { color:#9fb0c8; font-size:13px; }
+    .resp-card { background:#071018; border-radius:10px; padding:14px; margin-bottom:10px; border:1px solid rgba(255,255,255,0.03); }
+    .resp-title { font-weight:700; color:#e6eef6; font-size:14px; }
+    .resp-lat { color:#93aec6; font-size:12px; }
+    .muted-small { color:#93aec6; font-size:12px; }
+    .sidebar .stButton>button { background: linear-gradient(90deg,#4ade80,#60a5fa); color:#06202e; font-weight:700; border-radius:8px; }
+    .stTextArea textarea { background: #061018 !important; color: #e6eef6 !important; border: 1px solid rgba(255,255,255,0.03) !important; border-radius:8px !important; }
+    </style>
+    """
+SIDEBAR_HEADER_HTML = (
+    "<div style='display:flex; align-items:center; gap:12px;'><div style='width:34px;height:34px;border-radius:8px;background:linear-gradient(90deg,#fb923c,#ef4444)'></div>"
+    "<div><b style='font-size:16px'>n8n Multi — Controls</b><div class='muted' style='margin-top:4px'>Select models & input, then run.</div></div></div>"
+)
+MAIN_HEADER_HTML = (
+    "<div class='header-card'><div style='display:flex;align-items:center'><div class='avatar'></div>"
+    "<div><div style='font-size:18px;font-weight:700;color:#fff'>n8n Multi-Model UI — Sidebar</div>"
+    "<div class='muted' style='margin-top:6px'>Clean UI: controls in sidebar, results here.</div></div></div></div>"
+)